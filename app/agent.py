@@ -94,7 +94,9 @@ def detect_category_from_query(query):
             # These will be handled by CategoryGenerator AI creation
         }
         
-        query_lower = query.strip().lower()
+        from .category_generator import CategoryGenerator, normalize_query
+        
+        query_lower = normalize_query(query)
         
         # Check local mappings first
         if query_lower in local_mappings:
@@ -102,8 +104,6 @@ def detect_category_from_query(query):
             print(f"✅ Local mapping found: '{query}' → '{mapped_category}'")
             return mapped_category
         
-        from .category_generator import CategoryGenerator
-        
         # Use the new intelligent category detection system
         category_generator = CategoryGenerator()
         result = category_generator.intelligent_category_detection(query)
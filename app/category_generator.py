@@ -19,7 +19,7 @@ Fonksiyonlar:
 - Yeni kategori oluşturma
 - Prompt-chained AI mimarisi
 - Confidence scoring
-- JSON dosya yönetimi
+- JSON dosya yönetimi (mtime tabanlı ayrıştırma önbelleği)
 - Debug log'ları
 
 Gereksinimler:
@@ -30,8 +30,38 @@ Gereksinimler:
 
 import json
 import os
+import re
 from .config import setup_gemini, get_gemini_model, generate_with_retry
 
+# Arama sorgusu doğrulama - geçersiz sorgular Gemini'ye hiç gönderilmez
+MAX_QUERY_LENGTH = 128
+# URL, HTML etiketi ve kontrol karakteri içeren sorgular ürün araması değildir
+_QUERY_BLOCKLIST_RE = re.compile(r'https?://|www\.|<[^>]*>|[\x00-\x1f]', re.IGNORECASE)
+
+# AI'nin ürettiği kategori JSON'unda bulunması zorunlu alanlar
+_REQUIRED_CATEGORY_KEYS = frozenset(('budget_bands', 'specs'))
+
+# categories.json ayrıştırma önbelleği:
+# {dosya yolu: (mtime_ns, kategoriler, {normalize_query(ad): ad})}
+# Dosya değişmedikçe her yüklemede JSON yeniden ayrıştırılmaz; elle yapılan
+# düzenlemeler mtime değiştiği için yine algılanır.
+_CATEGORIES_CACHE = {}
+
+def normalize_query(query):
+    """
+    Kategori araması için sorguyu normalize eder (strip + casefold).
+    
+    casefold Unicode varsayılan dönüşümünü uygular, Türkçe'ye özgü değildir:
+    'I' -> 'i' olur (Türkçe 'ı' değil) ve 'İ' -> 'i̇' (i + birleşen nokta) olur.
+    Bu yüzden 'İ' önce düz 'i'ye çevrilir; 'I'/'ı' ayrımı korunmaz.
+    """
+    return query.strip().replace('İ', 'i').casefold()
+
+def _cache_categories(categories_path, mtime, categories):
+    """Ayrıştırılmış kategorileri ve normalize edilmiş ad indeksini önbelleğe yazar."""
+    name_index = {normalize_query(name): name for name in categories}
+    _CATEGORIES_CACHE[categories_path] = (mtime, categories, name_index)
+
 class CategoryGenerator:
     """
     Akıllı kategori tespiti ve oluşturma sınıfı - FindFlow için.
@@ -105,7 +135,9 @@ class CategoryGenerator:
             >>> print(result['category'])
             "Phone"
         """
-        query = query.strip().lower()
+        # Sorgu yalnızca burada normalize edilir ve önbellek anahtarı olarak
+        # da kullanılır; çağıranlar ham sorguyu geçer
+        query = normalize_query(query)
         print(f"🔍 Starting intelligent category detection for: '{query}'")
         
         # 🛡️ Check cache first to prevent duplicate API calls
@@ -148,20 +180,25 @@ class CategoryGenerator:
         """
         Mevcut kategorilerde tam eşleşme kontrol eder.
         
+        Eşleşme, normalize edilmiş kategori adları indeksi üzerinden yapılır;
+        böylece "phone" sorgusu "Phone" kategorisine eşlenir. Türkçe'ye özgü
+        büyük/küçük harf eşlemesi yapılmaz (bkz. normalize_query).
+        
         Args:
-            query (str): Kullanıcı sorgusu
+            query (str): normalize_query ile normalize edilmiş kullanıcı sorgusu
             categories (dict): Mevcut kategoriler
             
         Returns:
             dict or None: Eşleşme bulunursa sonuç, yoksa None
         """
-        if query in categories:
-            print(f"✅ Exact match found: '{query}'")
+        category_name = self._category_name_index().get(query)
+        if category_name in categories:
+            print(f"✅ Exact match found: '{query}' → '{category_name}'")
             return {
                 "match_type": "exact",
-                "category": query,
+                "category": category_name,
                 "confidence": 1.0,
-                "data": categories[query]
+                "data": categories[category_name]
             }
         return None
     
@@ -522,7 +559,7 @@ class CategoryGenerator:
             """
             
             print(f"🤖 Yeni kategori oluşturuluyor: {category_name} (Detaylı specler ve Türkiye pazarı araştırması ile)")
-            response = generate_with_retry(self.model, generation_prompt, max_retries=3, delay=3)
+            response = generate_with_retry(self.model, generation_prompt, max_retries=3, delay=3, stop_at_json=True)
             return self._parse_ai_response(response.text, category_name)
             
         except Exception as e:
@@ -704,16 +741,20 @@ class CategoryGenerator:
             # Try to parse JSON
             parsed = json.loads(json_content)
             
-            # Validate structure
-            if isinstance(parsed, dict) and "budget_bands" in parsed and "specs" in parsed:
+            # Validate structure - tek tip kontrolü + keys view alt küme karşılaştırması
+            if not isinstance(parsed, dict):
+                print(f"❌ Unexpected AI response format - not a JSON object")
+                return None
+            
+            if parsed.keys() >= _REQUIRED_CATEGORY_KEYS:
                 print(f"✅ Valid category structure found")
                 return parsed
-            elif isinstance(parsed, dict) and category_name in parsed:
+            elif category_name in parsed:
                 print(f"✅ Category found in nested structure")
                 return parsed[category_name]
             
             print(f"❌ Unexpected AI response format - missing required fields")
-            print(f"📊 Response keys: {list(parsed.keys()) if isinstance(parsed, dict) else 'Not a dict'}")
+            print(f"📊 Response keys: {list(parsed.keys())}")
             return None
             
         except json.JSONDecodeError as e:
@@ -741,23 +782,54 @@ class CategoryGenerator:
         print(f"❌ AI kategori oluşturma başarısız oldu: {category_name}")
         return None
     
+    def _categories_path(self):
+        """
+        categories.json dosyasının mutlak yolunu döndürür.
+        
+        Returns:
+            str: Kategori dosyası yolu
+        """
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        root_dir = os.path.dirname(current_dir)
+        return os.path.join(root_dir, self.categories_file)
+    
     def _load_categories(self):
         """
         Mevcut kategorileri yükler.
         
+        Dosya son yüklemeden beri değişmediyse (mtime aynıysa) önbellekteki
+        ayrıştırılmış kategoriler döner, tüm dosya yeniden okunmaz.
+        
         Returns:
             dict: Yüklenen kategoriler
         """
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            root_dir = os.path.dirname(current_dir)
-            categories_path = os.path.join(root_dir, self.categories_file)
+            categories_path = self._categories_path()
+            mtime = os.stat(categories_path).st_mtime_ns
+            
+            cached = _CATEGORIES_CACHE.get(categories_path)
+            if cached and cached[0] == mtime:
+                return cached[1]
             
             with open(categories_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                categories = json.load(f)
+            
+            _cache_categories(categories_path, mtime, categories)
+            return categories
         except:
             return {}
     
+    def _category_name_index(self):
+        """
+        Normalize edilmiş kategori adlarından gerçek adlara indeksi döndürür.
+        
+        Returns:
+            dict: {normalize_query(ad): ad}
+        """
+        self._load_categories()
+        cached = _CATEGORIES_CACHE.get(self._categories_path())
+        return cached[2] if cached else {}
+    
     def _save_new_category(self, category_name, category_data):
         """
         Yeni kategoriyi categories.json dosyasına kaydeder.
@@ -770,15 +842,16 @@ class CategoryGenerator:
             bool: Kaydetme başarılı mı?
         """
         try:
-            categories = self._load_categories()
+            # Önbellekteki sözlüğü yazma başarısız olursa bozmamak için kopyala
+            categories = dict(self._load_categories())
             categories[category_name] = category_data
             
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            root_dir = os.path.dirname(current_dir)
-            categories_path = os.path.join(root_dir, self.categories_file)
+            categories_path = self._categories_path()
             
             with open(categories_path, 'w', encoding='utf-8') as f:
                 json.dump(categories, f, indent=2, ensure_ascii=False)
+            
+            _cache_categories(categories_path, os.stat(categories_path).st_mtime_ns, categories)
                 
             print(f"✅ Category '{category_name}' saved successfully with detailed specifications")
             return True
@@ -815,7 +888,9 @@ def add_dynamic_category_route(app):
         
         Bu endpoint, kullanıcı sorgusunu alır ve akıllı kategori
         tespiti yapar. Mevcut kategorilerde eşleşme arar veya
-        yeni kategori oluşturur.
+        yeni kategori oluşturur. Boş, çok uzun, harf/rakam içermeyen
+        veya engelli kalıplara uyan sorgular AI çağrısı yapılmadan
+        400 ile reddedilir.
         
         Args:
             query (str): Kullanıcı arama sorgusu
@@ -823,10 +898,16 @@ def add_dynamic_category_route(app):
         Returns:
             dict: Tespit sonucu JSON formatında
         """
+        if (not query.strip() or len(query) > MAX_QUERY_LENGTH
+                or not any(c.isalnum() for c in query)
+                or _QUERY_BLOCKLIST_RE.search(query)):
+            print(f"🚫 Invalid search query rejected: '{query[:50]}'")
+            return {"status": "error", "message": "invalid query"}, 400
+        
         try:
             print(f"🔍 Search request for: '{query}'")
             
-            # Use intelligent category detection
+            # Use intelligent category detection (sorguyu kendisi normalize eder)
             result = category_generator.intelligent_category_detection(query)
             
             # Format response based on match type
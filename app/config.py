@@ -12,6 +12,7 @@ Ana Fonksiyonlar:
 - setup_gemini(): Gemini API'yi yapılandırır
 - get_gemini_model(): Optimize edilmiş Gemini modeli döner
 - generate_with_retry(): Retry mekanizması ile API istekleri gönderir
+  (stop_at_json=True ile yanıt stream edilir, JSON nesnesi kapanınca döner)
 
 Özellikler:
 - Otomatik API yapılandırması
@@ -28,14 +29,90 @@ Gereksinimler:
 import os
 from dotenv import load_dotenv
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+import random
 import time
 
+# .env dosyası modül yüklenirken bir kez okunur; setup_gemini her çağrıda
+# dosya sistemini taramaz
+load_dotenv()
+_GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+_CONFIGURED = False
+
+# Yalnızca geçici hatalar (kota, servis kesintisi) tekrar denenir; 400/403 gibi
+# hatalar tekrar denense de başarılı olmaz, kotayı boşa harcamadan hemen döner
+_RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+_MAX_RETRY_DELAY = 30
+
+
+class StreamedJSONResponse:
+    """
+    Stream edilen Gemini yanıtından erken kesilmiş metni taşır.
+
+    generate_with_retry(stop_at_json=True) ilk tam JSON nesnesi geldiğinde
+    stream'i bırakır; çağıranlar yalnızca .text alanını kullandığı için
+    tam response nesnesi yerine bu hafif sarmalayıcı döner.
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+
+def _consume_json_stream(stream):
+    """
+    Gemini stream'ini okur ve ilk JSON nesnesi kapandığında durur.
+
+    Parantez dengesi chunk'lar arasında korunan bir durumla artımlı olarak
+    taranır (string içindeki { } ve kaçış karakterleri yok sayılır), böylece
+    her chunk'ta tüm buffer yeniden taranmaz.
+
+    Args:
+        stream: model.generate_content(..., stream=True) sonucu
+
+    Returns:
+        str: JSON nesnesini içeren metin (nesne kapanmadıysa tüm metin)
+    """
+    buffer = ''
+    scanned = 0
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for chunk in stream:
+        buffer += chunk.text
+        for i in range(scanned, len(buffer)):
+            char = buffer[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"' and depth:
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}' and depth:
+                depth -= 1
+                if depth == 0:
+                    return buffer[:i + 1]
+        scanned = len(buffer)
+
+    return buffer
+
 def setup_gemini():
     """
     Gemini API'yi yapılandırır ve başlatır - FindFlow için optimize edilmiş.
     
-    .env dosyasından API anahtarını okur ve Gemini API'yi yapılandırır.
-    Başarılı yapılandırma durumunda True, başarısız durumda False döner.
+    Modül yüklenirken .env dosyasından okunan API anahtarı ile Gemini API'yi
+    yapılandırır. Yapılandırma bir kez yapılır, sonraki çağrılar doğrudan True
+    döner. Başarılı yapılandırma durumunda True, başarısız durumda False döner.
     
     Returns:
         bool: Yapılandırma başarılı mı?
@@ -46,10 +123,14 @@ def setup_gemini():
         ... else:
         ...     print("Gemini API yapılandırılamadı")
     """
-    load_dotenv()
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-    if GEMINI_API_KEY:
-        genai.configure(api_key=GEMINI_API_KEY)
+    global _CONFIGURED
+    if _CONFIGURED:
+        return True
+    if _GEMINI_API_KEY:
+        # gRPC transport tek bir HTTP/2 kanalını tüm isteklerde paylaşır;
+        # her generate_content çağrısında yeni TLS el sıkışması yapılmaz
+        genai.configure(api_key=_GEMINI_API_KEY, transport='grpc')
+        _CONFIGURED = True
         return True
     return False
 
@@ -99,22 +180,28 @@ def get_gemini_model():
         safety_settings=safety_settings
     )
 
-def generate_with_retry(model, prompt, max_retries=2, delay=10):
+def generate_with_retry(model, prompt, max_retries=2, delay=10, stop_at_json=False):
     """
     Gemini API'ye retry mekanizması ile istek gönderir.
     
     Bu fonksiyon, API isteklerini güvenilir hale getirmek için
-    exponential backoff retry mekanizması kullanır. Her başarısız
-    denemeden sonra bekleme süresi artırılır.
+    jitter'lı exponential backoff retry mekanizması kullanır. Her başarısız
+    denemeden sonra bekleme süresi artırılır; rastgele sapma, aynı anda
+    hata alan worker'ların senkronize şekilde tekrar denemesini önler.
+    Tekrar denenemez API hataları (örn. 400 InvalidArgument) beklemeden
+    sonlandırılır.
     
     Args:
         model (genai.GenerativeModel): Gemini model nesnesi
         prompt (str): AI'ya gönderilecek prompt metni
         max_retries (int): Maksimum deneme sayısı (varsayılan: 3)
         delay (int): İlk deneme arası bekleme süresi (varsayılan: 2)
+        stop_at_json (bool): Yanıtı stream et ve ilk JSON nesnesi kapanınca
+            dön; model JSON'dan sonra üretmeye devam etse de beklenmez
         
     Returns:
-        genai.types.GenerateContentResponse or None: API yanıtı veya None
+        genai.types.GenerateContentResponse or StreamedJSONResponse or None:
+            API yanıtı veya None
         
     Raises:
         Exception: Tüm denemeler başarısız olduğunda
@@ -128,32 +215,46 @@ def generate_with_retry(model, prompt, max_retries=2, delay=10):
     for attempt in range(max_retries):
         try:
             print(f"🔄 Gemini API isteği (deneme {attempt + 1}/{max_retries})")
-            response = model.generate_content(prompt)
-            
-            # Detailed response checking
-            if response and hasattr(response, 'text') and response.text:
-                print(f"✅ Gemini API başarılı (deneme {attempt + 1})")
-                print(f"📄 Response length: {len(response.text)} characters")
-                return response
-            elif response and hasattr(response, 'candidates') and response.candidates:
-                # Check if response was blocked
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'finish_reason'):
-                    print(f"⚠️ Response blocked: {candidate.finish_reason} (deneme {attempt + 1})")
-                    if hasattr(candidate, 'safety_ratings'):
-                        print(f"🛡️ Safety ratings: {candidate.safety_ratings}")
-                else:
-                    print(f"⚠️ Boş yanıt alındı (deneme {attempt + 1})")
+            if stop_at_json:
+                text = _consume_json_stream(model.generate_content(prompt, stream=True))
+                if text:
+                    print(f"✅ Gemini API başarılı (stream, deneme {attempt + 1})")
+                    print(f"📄 Response length: {len(text)} characters")
+                    return StreamedJSONResponse(text)
+                print(f"⚠️ Boş yanıt alındı (deneme {attempt + 1})")
             else:
-                print(f"⚠️ Geçersiz response objesi (deneme {attempt + 1})")
+                response = model.generate_content(prompt)
+                
+                # Detailed response checking
+                if response and hasattr(response, 'text') and response.text:
+                    print(f"✅ Gemini API başarılı (deneme {attempt + 1})")
+                    print(f"📄 Response length: {len(response.text)} characters")
+                    return response
+                elif response and hasattr(response, 'candidates') and response.candidates:
+                    # Check if response was blocked
+                    candidate = response.candidates[0]
+                    if hasattr(candidate, 'finish_reason'):
+                        print(f"⚠️ Response blocked: {candidate.finish_reason} (deneme {attempt + 1})")
+                        if hasattr(candidate, 'safety_ratings'):
+                            print(f"🛡️ Safety ratings: {candidate.safety_ratings}")
+                    else:
+                        print(f"⚠️ Boş yanıt alındı (deneme {attempt + 1})")
+                else:
+                    print(f"⚠️ Geçersiz response objesi (deneme {attempt + 1})")
                 
+        except _RETRYABLE_ERRORS as e:
+            print(f"❌ Gemini API geçici hatası (deneme {attempt + 1}): {e}")
+        except google_exceptions.GoogleAPICallError as e:
+            print(f"❌ Gemini API hatası, tekrar denenmeyecek (deneme {attempt + 1}): {e}")
+            return None
         except Exception as e:
             print(f"❌ Gemini API hatası (deneme {attempt + 1}): {e}")
             
         # Wait before retry (except on last attempt)
         if attempt < max_retries - 1:
-            print(f"⏳ {delay} saniye bekleniyor...")
-            time.sleep(delay)
+            wait = min(_MAX_RETRY_DELAY, delay * random.uniform(0.5, 1.5))  # Jitter, üst sınır dahil
+            print(f"⏳ {wait:.1f} saniye bekleniyor...")
+            time.sleep(wait)
             delay *= 1.5  # Exponential backoff
     
     print(f"❌ Tüm denemeler başarısız oldu ({max_retries} deneme)")
@@ -22,7 +22,7 @@ API Endpoint'leri:
 - /ask: Soru-cevap akışını yönet
 - /: Ana web sayfası
 
-Gereksinimler:
+Gereksinimler (pip install -r requirements.txt):
 - Flask web framework
 - Google Generative AI (Gemini)
 - .env dosyasında GEMINI_API_KEY tanımlı olmalı
@@ -30,12 +30,23 @@ Gereksinimler:
 Kullanım:
     python run.py
     # Uygulama http://localhost:8080 adresinde çalışır
+    # Debug modu + auto-reloader için: FINDFLOW_DEBUG=1 python run.py
+
+Production:
+    gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:8080 run:app
+    # gevent worker kullanılmaz: Gemini istemcisi grpc transport'u ile çalışır
+    # ve grpcio'nun C çekirdeği gevent hub'ını bloklar
 """
 
-# Ensure requirements are installed at startup
+# Bağımlılıklar kurulum adımında yüklenir: pip install -r requirements.txt
+# Eski otomatik kurulum davranışı için FINDFLOW_INSTALL_DEPS=1 tanımlanabilir.
 import subprocess
 import sys
 import os
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 def install_requirements():
     """
@@ -44,14 +55,17 @@ def install_requirements():
     Bu fonksiyon, requirements.txt dosyasındaki tüm bağımlılıkları
     otomatik olarak kurar. Eğer paketler zaten kuruluysa, 
     pip bunu atlar ve hata vermez.
+    
+    Her worker başlangıcında pip çalıştırmak cold-start süresini uzattığı
+    için yalnızca FINDFLOW_INSTALL_DEPS=1 olduğunda çağrılır.
     """
     req_file = os.path.join(os.path.dirname(__file__), 'requirements.txt')
     subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', req_file])
 
-install_requirements()
+if os.getenv('FINDFLOW_INSTALL_DEPS') == '1':
+    install_requirements()
 
-import json
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify
 from dotenv import load_dotenv
 from app.agent import Agent
 from app.agent import detect_category_from_query
@@ -60,12 +74,67 @@ from app.agent import detect_category_from_query
 load_dotenv()
 from app.category_generator import add_dynamic_category_route
 
-app = Flask(__name__, static_folder='website')
-agent = Agent()
+# website/ kökten sunulur (/main.js gibi); Flask'ın yerleşik static route'u
+# send_file üzerinden gider ve gunicorn altında wsgi.file_wrapper (sendfile)
+# kullanır. main.js sürümlenmediği için tarayıcı önbelleği 1 saatle sınırlı.
+app = Flask(__name__, static_folder='website', static_url_path='')
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
+# jsonify çıktısı: anahtar sıralaması ve girinti yok, Türkçe karakterler
+# \uXXXX kaçışı yerine UTF-8 olarak yazılır (daha küçük ve hızlı yanıtlar)
+app.json.sort_keys = False
+app.json.compact = True
+app.json.ensure_ascii = False
+
+# Agent (Gemini istemcisi, kategori yükleme) import sırasında değil ilk /ask
+# isteğinde oluşturulur; WSGI import'u ve gunicorn worker açılışı hızlı kalır
+_agent = None
+
+def get_agent():
+    """Paylaşılan Agent örneğini döndürür, gerekirse oluşturur."""
+    global _agent
+    if _agent is None:
+        _agent = Agent()
+    return _agent
 
 # Dinamik kategori oluşturma özelliğini ekle
 add_dynamic_category_route(app)
 
+# İstek logları: endpoint yalnızca kuyruğa yazar, debug_log.txt'e yazma işini
+# arka plandaki QueueListener thread'i yapar (istek yolunda dosya I/O yok)
+# Seviye FINDFLOW_LOG_LEVEL ile ayarlanır (varsayılan: FINDFLOW_DEBUG açıksa
+# DEBUG, değilse INFO); filtrelenen kayıtlar için %s biçimlendirmesi yapılmaz.
+# Geçersiz bir değer (ör. 'verbose') uygulamanın import'unu düşürmez; INFO
+# kullanılır ve uyarı yazılır.
+logger = logging.getLogger('findflow')
+_log_level_name = os.getenv('FINDFLOW_LOG_LEVEL',
+                            'DEBUG' if os.getenv('FINDFLOW_DEBUG') else 'INFO').upper()
+_log_level = logging.getLevelName(_log_level_name)
+if not isinstance(_log_level, int):
+    print(f"⚠️ Geçersiz FINDFLOW_LOG_LEVEL '{_log_level_name}', INFO kullanılıyor")
+    _log_level = logging.INFO
+logger.setLevel(_log_level)
+_log_queue = queue.Queue(-1)
+_log_file_handler = logging.FileHandler('debug_log.txt', encoding='utf-8')
+_log_file_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_listener = QueueListener(_log_queue, _log_file_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logger.addHandler(QueueHandler(_log_queue))
+
+# /categories yanıt önbelleği: (mtime_ns, dosyanın ham JSON baytları)
+# Dinamik kategori eklendiğinde dosyanın mtime'ı değişir ve önbellek yenilenir.
+_CATEGORIES_FILE = 'categories.json'
+_categories_body = (None, b'{}')
+
+def _categories_json_bytes():
+    """categories.json içeriğini, dosya değişmedikçe yeniden okumadan döndürür."""
+    global _categories_body
+    mtime = os.stat(_CATEGORIES_FILE).st_mtime_ns
+    if _categories_body[0] != mtime:
+        with open(_CATEGORIES_FILE, 'rb') as f:
+            _categories_body = (mtime, f.read())
+    return _categories_body[1]
+
 @app.route('/detect_category', methods=['POST'])
 def detect_category():
     """
@@ -88,12 +157,7 @@ def detect_category():
     kullanarak yeni kategori oluşturur.
     """
     data = request.json
-    print("=" * 50)
-    print("🔍 /detect_category endpointine gelen veri:", data)
-    print("=" * 50)
-    # Dosyaya da yazadıralım
-    with open('debug_log.txt', 'a', encoding='utf-8') as f:
-        f.write(f"🔍 /detect_category veri: {data}\n")
+    logger.debug("[in] /detect_category veri: %s", data)
     query = data.get('query', '')
     category = detect_category_from_query(query)
     return jsonify({'category': category})
@@ -111,22 +175,6 @@ def index():
     """
     return app.send_static_file('main.html')
 
-@app.route('/<path:filename>')
-def static_files(filename):
-    """
-    Statik dosyaları (CSS, JS, resimler) sunar.
-    
-    Bu endpoint, web sitesinin statik dosyalarını (JavaScript,
-    CSS, resimler vb.) sunar.
-    
-    Args:
-        filename: İstenen dosya adı
-        
-    Returns:
-        İstenen statik dosya
-    """
-    return send_from_directory(app.static_folder, filename)
-
 @app.route('/categories')
 def get_categories():
     """
@@ -135,12 +183,13 @@ def get_categories():
     Bu endpoint, frontend'in kategori listesini göstermesi
     için kullanılır. Her kategori için soru ve emoji bilgilerini içerir.
     
+    Dosya zaten geçerli JSON olduğu için ham baytlar doğrudan döner;
+    json.load + jsonify turu atlanır.
+    
     Returns:
         JSON: Kategori listesi ve özellikleri
     """
-    with open('categories.json', 'r', encoding='utf-8') as f:
-        categories = json.load(f)
-    return jsonify(categories)
+    return Response(_categories_json_bytes(), mimetype='application/json')
 
 @app.route('/ask', methods=['POST'])
 def ask():
@@ -171,15 +220,22 @@ def ask():
     - Çok dilli destek
     """
     data = request.json
-    print("=" * 50)
-    print("📩 /ask endpointine gelen veri:", data)
-    print("=" * 50)
-    # Dosyaya da yazdıralım
-    with open('debug_log.txt', 'a', encoding='utf-8') as f:
-        f.write(f"📩 /ask veri: {data}\n")
-    response = agent.handle(data)
+    logger.debug("[in] /ask veri: %s", data)
+    response = get_agent().handle(data)
     return jsonify(response)
 
+# AmazonAPI örneği ilk kullanımda bir kez oluşturulur ve istekler arasında
+# paylaşılır (modül opsiyonel olduğu için import da ilk kullanıma ertelenir)
+_amazon_api = None
+
+def _get_amazon_api():
+    """Paylaşılan AmazonAPI örneğini döndürür, gerekirse oluşturur."""
+    global _amazon_api
+    if _amazon_api is None:
+        from app.amazon_api import AmazonAPI
+        _amazon_api = AmazonAPI()
+    return _amazon_api
+
 @app.route('/amazon/product/<asin>', methods=['GET'])
 def get_amazon_product(asin):
     """
@@ -194,10 +250,7 @@ def get_amazon_product(asin):
         JSON: Ürün detayları
     """
     try:
-        from app.amazon_api import AmazonAPI
-        
-        api = AmazonAPI()
-        product_details = api.get_product_details(asin)
+        product_details = _get_amazon_api().get_product_details(asin)
         
         if product_details:
             return jsonify({
@@ -211,7 +264,7 @@ def get_amazon_product(asin):
             }), 404
             
     except Exception as e:
-        print(f"❌ Amazon ürün detay hatası: {e}")
+        logger.error("[err] Amazon ürün detay hatası: %s", e)
         return jsonify({
             'success': False,
             'error': 'Ürün detayları alınamadı'
@@ -234,16 +287,13 @@ def search_amazon_products():
         JSON: Bulunan ürünler
     """
     try:
-        from app.amazon_api import AmazonAPI
-        
         data = request.json
         query = data.get('query', '')
         max_results = data.get('max_results', 10)
         min_price = data.get('min_price')
         max_price = data.get('max_price')
         
-        api = AmazonAPI()
-        products = api.search_products(
+        products = _get_amazon_api().search_products(
             query=query,
             max_results=max_results,
             min_price=min_price,
@@ -257,7 +307,7 @@ def search_amazon_products():
         })
         
     except Exception as e:
-        print(f"❌ Amazon arama hatası: {e}")
+        logger.error("[err] Amazon arama hatası: %s", e)
         return jsonify({
             'success': False,
             'error': 'Arama yapılamadı'
@@ -265,9 +315,14 @@ def search_amazon_products():
 
 if __name__ == '__main__':
     """
-    Uygulamayı geliştirme modunda başlatır.
+    Uygulamayı Werkzeug sunucusuyla port 8080'de başlatır.
     
-    Debug modu açık, port 8080'de çalışır.
-    Production ortamında debug=False yapılmalıdır.
+    Debug modu ve auto-reloader yalnızca FINDFLOW_DEBUG tanımlıysa açılır;
+    reloader her istekte dosyaları stat'lar ve throughput'u düşürür.
+    Production ortamında bir WSGI sunucusu kullanılmalıdır:
+        gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:8080 run:app
     """
-    app.run(debug=True, port=8080)
\ No newline at end of file
+    if os.getenv('FINDFLOW_DEBUG'):
+        app.run(debug=True, port=8080)
+    else:
+        app.run(debug=False, use_reloader=False, port=8080, threaded=True)
\ No newline at end of file